@@ -103,5 +103,5 @@ setup(
         'pyserial',
         'gsm0338'
     ],
-    python_requires='>3.5'
+    python_requires='>=3.6'
 )
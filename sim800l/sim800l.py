@@ -7,6 +7,7 @@
 
 import os
 import time
+import select
 import sys
 import traceback
 import serial
@@ -15,9 +16,9 @@ import logging
 from datetime import datetime
 import subprocess
 import termios
-import tty
 import gsm0338
 import zlib
+import functools
 try:
     from RPi import GPIO
 except ModuleNotFoundError:
@@ -84,13 +85,85 @@ httpaction_status_codes = {
 
 ATTEMPT_DELAY = 0.2
 
+CACHE_TTL = 0.5  # seconds
+
+RESET_QUIET = 3  # seconds of silence after a reset before polling the module
+
+SMS_PROMPT_TIMEOUT = 5  # seconds
+
+VERBOSE = 5  # logging level tracing each request/response
+logging.addLevelName(VERBOSE, "VERBOSE")
+
+# Patterns parsing the AT command replies
+RE_CCLK = re.compile(r'"(\d*/\d*/\d*,\d*:\d*:\d*)')
+RE_QUOTED = re.compile(r'.*"(.*)"')  # text within the last pair of quotes
+RE_CNUM = re.compile(r'","([+0-9][0-9]*)",')
+RE_CMTE = re.compile(r'\+CMTE: \d*,([0-9.]*)')
+
+
+def gsm_encoding_table():
+    """
+    Build the str.translate() table mapping each character of the GSM 03.38
+    alphabet to its encoded septets (one or two characters, escape included).
+    ASCII characters outside the alphabet are mapped to a non-ASCII
+    placeholder, so that they are left to the codec.
+    :return: translation table (dictionary)
+    """
+    table = dict.fromkeys(range(128), '\uffff')
+    for code in range(128):
+        for seq in (bytes((code,)), bytes((0x1b, code))):
+            char = seq.decode('gsm03.38', errors='ignore')
+            if len(char) == 1:
+                table[ord(char)] = char.encode('gsm03.38').decode('latin-1')
+    return table
+
+
+GSM_ENCODING_TABLE = gsm_encoding_table()
+
+
+def gsm_decoding_table():
+    """
+    Build the str.translate() table mapping each byte (as latin-1 character)
+    to the related GSM 03.38 character; bytes not belonging to the alphabet
+    are mapped to None (removed). The escape byte is not mapped.
+    :return: translation table (dictionary)
+    """
+    table = {}
+    for code in range(256):
+        if code != 0x1b:
+            char = bytes((code,)).decode('gsm03.38', errors='ignore')
+            table[code] = char or None
+    return table
+
+
+GSM_DECODING_TABLE = gsm_decoding_table()
+
+# Blank characters of the gsm03.38 alphabet (bytes.strip() would also remove
+# 0x09, 0x0b and 0x0c, which are letters in gsm03.38)
+GSM_BLANKS = b' \r\n'
+
+# Most frequent lines returned by the module, converted without decoding
+ACK_STRINGS = {
+    b'': '',
+    b'OK': 'OK',
+    b'>': '>',
+    b'DOWNLOAD': 'DOWNLOAD',
+    b'ERROR': 'ERROR'
+}
+
+
 def convert_to_string(buf):
     """
     Convert gsm03.38 bytes to string
     :param buf: gsm03.38 bytes
     :return: UTF8 string
     """
-    return buf.decode('gsm03.38', errors="ignore").strip()
+    ack = ACK_STRINGS.get(buf.strip(GSM_BLANKS))
+    if ack is not None:
+        return ack
+    if b'\x1b' in buf:  # escape sequences (extension table) use the codec
+        return buf.decode('gsm03.38', errors="ignore").strip()
+    return buf.decode('latin-1').translate(GSM_DECODING_TABLE).strip()
 
 
 def convert_gsm(string):
@@ -99,7 +172,69 @@ def convert_gsm(string):
     :param string: UTF8 string
     :return: gsm03.38 bytes
     """
-    return string.encode("gsm03.38")
+    try:
+        return string.translate(GSM_ENCODING_TABLE).encode('ascii')
+    except UnicodeEncodeError:  # character not in the table
+        return string.encode("gsm03.38")
+
+
+@functools.lru_cache(maxsize=256)
+def convert_command(cmdstr):
+    """
+    Encode an AT command with convert_gsm(), caching the result (AT command
+    strings are mostly constant)
+    :param cmdstr: AT command string
+    :return: gsm03.38 bytes
+    """
+    return convert_gsm(cmdstr)
+
+
+def reply_fields(reply, name):
+    """
+    Split the comma separated fields of an AT command reply
+    (e.g., "+CSQ: 20,0")
+    :param reply: reply string
+    :param name: expected reply name (e.g., "+CSQ")
+    :return: list of fields (strings); empty list if the name does not match
+    """
+    head, _, fields = reply.partition(': ')
+    if head != name:
+        return []
+    return fields.split(',')
+
+
+CMD_CSCS_HEX = convert_gsm('AT+CSCS="HEX"')
+CMD_CSCS_IRA = convert_gsm('AT+CSCS="IRA"')
+CMTI_SM = b'+CMTI: "SM",'
+FINAL_RESULT_CODES = (b'\nOK\r', b'ERROR')
+
+
+def ttl_cache(ttl):
+    """
+    Decorator caching the result of a SIM800L query method, so that repeated
+    calls do not send the same AT command to the module. None results
+    (module error) are not cached; with no expiry, only successful (true)
+    results are cached.
+    :param ttl: number of seconds the cached result is considered valid;
+        None if it never expires (values of the module which cannot change)
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            cached = self._cache.get(key)
+            if cached and (cached[0] is None or now < cached[0]):
+                return cached[1]
+            result = method(self, *args, **kwargs)
+            if ttl is None:
+                if result:
+                    self._cache[key] = (None, result)
+            elif result is not None:
+                self._cache[key] = (now + ttl, result)
+            return result
+        return wrapper
+    return decorator
 
 
 class SIM800L:
@@ -107,6 +242,20 @@ class SIM800L:
     Main class
     """
 
+    __slots__ = (
+        'ser',
+        'incoming_action',
+        'no_carrier_action',
+        'clip_action',
+        '_clip',
+        'msg_action',
+        '_msgid',
+        'savbuf',
+        '_cache',
+        '_rxbuf',
+        '__weakref__'
+    )
+
     def __init__(self, port="/dev/serial0", baudrate=115000, timeout=3.0):
         """
         SIM800L Class constructor
@@ -124,11 +273,20 @@ class SIM800L:
             logging.critical("SIM800L - Error opening GSM serial port - %s", e)
             return
 
+        # Raw mode without echo (same flags as tty.setraw), in a single call
         fd = self.ser.fileno()
-        attr = termios.tcgetattr(fd)
-        attr[3] &= ~termios.ECHO
-        termios.tcsetattr(fd, termios.TCSANOW, attr)
-        tty.setraw(fd)
+        iflag, oflag, cflag, lflag, ispeed, ospeed, cc = termios.tcgetattr(fd)
+        iflag &= ~(termios.BRKINT | termios.ICRNL | termios.INPCK |
+                   termios.ISTRIP | termios.IXON)
+        oflag &= ~termios.OPOST
+        cflag &= ~(termios.CSIZE | termios.PARENB)
+        cflag |= termios.CS8
+        lflag &= ~(termios.ECHO | termios.ICANON | termios.IEXTEN |
+                   termios.ISIG)
+        cc[termios.VMIN] = 1
+        cc[termios.VTIME] = 0
+        termios.tcsetattr(fd, termios.TCSAFLUSH,
+                          [iflag, oflag, cflag, lflag, ispeed, ospeed, cc])
 
         self.incoming_action = None
         self.no_carrier_action = None
@@ -137,7 +295,24 @@ class SIM800L:
         self.msg_action = None
         self._msgid = 0
         self.savbuf = None
+        self._cache = {}
+        self._rxbuf = bytearray()  # data read from the port, not consumed yet
 
+    def clear_cache(self):
+        """
+        Discard the cached results of the query methods
+        """
+        self._cache.clear()
+
+    def _discard_cache(self, *names):
+        """
+        Discard the cached results of the given query methods
+        :param names: method names
+        """
+        for key in [key for key in self._cache if key[0] in names]:
+            del self._cache[key]
+
+    @ttl_cache(CACHE_TTL)
     def check_sim(self):
         """
         Check whether the SIM card has been inserted.
@@ -147,7 +322,8 @@ class SIM800L:
         sim = self.command_data_ok('AT+CSMINS?')
         if not sim:
             return None
-        return re.sub(r'\+CSMINS: \d*,(\d*).*', r'\1', sim) == '1'
+        fields = reply_fields(sim, '+CSMINS')  # <n>,<SIM inserted>
+        return len(fields) > 1 and fields[1].strip() == '1'
 
     def get_date(self):
         """
@@ -158,10 +334,14 @@ class SIM800L:
         if not date_string:
             return None
         logging.debug("SIM800L - date_string: %s", date_string)
-        date = re.sub(r'.*"(\d*/\d*/\d*,\d*:\d*:\d*).*', r"\1", date_string)
+        match = RE_CCLK.search(date_string)
+        if not match:
+            return None
+        date = match.group(1)
         logging.debug("SIM800L - date: %s", date)
         return datetime.strptime(date, '%y/%m/%d,%H:%M:%S')
 
+    @ttl_cache(CACHE_TTL)
     def is_registered(self):
         """
         Check whether the SIM is Registered, home network
@@ -171,11 +351,10 @@ class SIM800L:
         reg = self.command_data_ok('AT+CREG?')
         if not reg:
             return None
-        registered = re.sub(r'^\+CREG: (\d*),(\d*)$', r"\2", reg)
-        if registered == "1" or registered == "5":
-            return True
-        return False
+        fields = reply_fields(reg, '+CREG')  # <n>,<stat>[,...]
+        return len(fields) > 1 and fields[1] in ("1", "5")
 
+    @ttl_cache(CACHE_TTL)
     def get_operator(self):
         """
         Display the current network operator that the handset is currently
@@ -184,10 +363,12 @@ class SIM800L:
             module error.
         """
         operator_string = self.command_data_ok('AT+COPS?')
-        operator = re.sub(r'.*"(.*)".*', r'\1', operator_string).capitalize()
-        if operator.startswith("+COPS: 0"):
+        if not operator_string:
+            return None
+        match = RE_QUOTED.search(operator_string)
+        if not match:  # e.g., "+COPS: 0" (no operator)
             return False
-        return operator
+        return match.group(1).capitalize()
 
     def get_operator_list(self):
         """
@@ -198,6 +379,7 @@ class SIM800L:
         operator_string = self.command('AT+COPN\n', lines=0)
         expire = time.monotonic() + 60  # seconds
         while time.monotonic() < expire:
+            self._wait_incoming(expire)
             r = self.check_incoming()
             if not r:
                 return None
@@ -211,6 +393,7 @@ class SIM800L:
             ret[r[1]] = r[2]
         return ret
 
+    @ttl_cache(CACHE_TTL)
     def get_service_provider(self):
         """
         Get the Get Service Provider Name stored inside the SIM
@@ -222,8 +405,10 @@ class SIM800L:
             return None
         if sprov_string == "ERROR":
             return False
-        sprov = re.sub(r'.*"(.*)".*', r'\1', sprov_string)
-        return sprov
+        match = RE_QUOTED.search(sprov_string)
+        if not match:
+            return None
+        return match.group(1)
 
     def get_battery_voltage(self):
         """
@@ -233,8 +418,10 @@ class SIM800L:
         battery_string = self.command_data_ok('AT+CBC')
         if not battery_string:
             return None
-        battery = re.sub(r'\+CBC: \d*,\d*,(\d*)', r'\1', battery_string)
-        return int(battery) / 1000
+        fields = reply_fields(battery_string, '+CBC')  # <bcs>,<bcl>,<voltage>
+        if len(fields) < 3 or not fields[2].isdigit():
+            return None
+        return int(fields[2]) / 1000
 
     def get_msisdn(self):
         """
@@ -250,9 +437,12 @@ class SIM800L:
         if r != ("OK", None):
             logging.error("SIM800L - wrong return message: %s", r)
             return None
-        msisdn = re.sub(r'.*","([+0-9][0-9]*)",.*', r'\1', msisdn_string)
-        return msisdn
+        match = RE_CNUM.search(msisdn_string)
+        if not match:
+            return None
+        return match.group(1)
 
+    @ttl_cache(CACHE_TTL)
     def get_signal_strength(self):
         """
         Get the signal strength
@@ -261,11 +451,15 @@ class SIM800L:
         signal_string = self.command_data_ok('AT+CSQ')
         if not signal_string:
             return None
-        signal = int(re.sub(r'\+CSQ: (\d*),.*', r'\1', signal_string))
+        fields = reply_fields(signal_string, '+CSQ')  # <rssi>,<ber>
+        if not fields or not fields[0].isdigit():
+            return None
+        signal = int(fields[0])
         if signal == 99:
             return 0
         return (signal + 1) / 0.32  # min = 3, max = 100
 
+    @ttl_cache(None)
     def get_unit_name(self):
         """
         Get the SIM800 GSM module unit name
@@ -273,14 +467,23 @@ class SIM800L:
         """
         return self.command_data_ok('ATI')
 
+    @ttl_cache(None)
+    def _get_revision(self, cmd):
+        """
+        Query the revision of the SIM800 GSM module
+        :param cmd: AT command (AT+GMR or AT+CGMR)
+        :return: string; None in case of module error.
+        """
+        return self.command_data_ok(cmd)
+
     def get_hw_revision(self, method=0):
         """
         Get the SIM800 GSM module hw revision
         :return: string; None in case of module error.
         """
         if method == 2:
-            return self.command_data_ok('AT+GMR')
-        firmware = self.command_data_ok('AT+CGMR')
+            return self._get_revision('AT+GMR')
+        firmware = self._get_revision('AT+CGMR')
         if not firmware:
             return None
         if method == 1:
@@ -291,6 +494,7 @@ class SIM800L:
             logging.info("Hardware Model type: %s", firmware[23:])
         return firmware
 
+    @ttl_cache(None)
     def get_serial_number(self):
         """
         Get the SIM800 GSM module serial number
@@ -320,8 +524,10 @@ class SIM800L:
         temp_string = self.command_data_ok('AT+CMTE?')
         if not temp_string:
             return None
-        temp = re.sub(r'\+CMTE: \d*,([0-9.]*).*', r'\1', temp_string)
-        return temp
+        match = RE_CMTE.search(temp_string)
+        if not match:
+            return None
+        return match.group(1)
 
     def get_flash_id(self):
         """
@@ -338,12 +544,15 @@ class SIM800L:
         date = self.get_date()
         if not date:
             return None
-        date_string = date.strftime('%c')
-        with subprocess.Popen(
-                ["sudo", "date", "-s", date_string],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.STDOUT) as sudodate:
-            sudodate.communicate()
+        try:
+            time.clock_settime(time.CLOCK_REALTIME, date.timestamp())
+        except (AttributeError, OSError):  # not root (or not Linux)
+            date_string = date.strftime('%c')
+            with subprocess.Popen(
+                    ["sudo", "date", "-s", date_string],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.STDOUT) as sudodate:
+                sudodate.communicate()
         return date
 
     def setup(self):
@@ -397,14 +606,35 @@ class SIM800L:
         Set HEX character set (only hexadecimal values from 00 to FF)
         :return: "OK" if successful, otherwise None
         """
-        return self.command_ok('AT+CSCS="HEX"')
+        return self.command_ok(CMD_CSCS_HEX)
 
     def set_charset_ira(self):
         """
         Set the International reference alphabet (ITU-T T.50) character set
         :return: "OK" if successful, otherwise None
         """
-        return self.command_ok('AT+CSCS="IRA"')
+        return self.command_ok(CMD_CSCS_IRA)
+
+    def command_with_charset(self, charset, cmdstr, **kwargs):
+        """
+        Set the character set and execute an AT command with a single
+        round-trip, chaining AT+CSCS and the command on the same line.
+        The character set stays selected after the command.
+        :param charset: character set (e.g., "GSM", "HEX", "IRA")
+        :param cmdstr: AT command string (or gsm03.38 bytes, already
+            encoded), including the ending newline
+        :param kwargs: other arguments of command()
+        :return: see command()
+        """
+        if isinstance(cmdstr, bytes):
+            if cmdstr[:2].upper() == b'AT':
+                cmdstr = cmdstr[2:]
+            return self.command(
+                convert_command(f'AT+CSCS="{charset}";') + cmdstr, **kwargs)
+        if cmdstr[:2].upper() == 'AT':
+            cmdstr = cmdstr[2:]
+        return self.command(
+            f'AT+CSCS="{charset}";{cmdstr}', **kwargs)
 
     def hard_reset(self, reset_gpio):
         """
@@ -417,14 +647,39 @@ class SIM800L:
         if not GPIO:
             logging.critical("SIM800L - hard_reset() function not available")
             return None
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(reset_gpio, GPIO.OUT, initial=GPIO.HIGH)
-        GPIO.output(reset_gpio, GPIO.HIGH)
-        GPIO.output(reset_gpio, GPIO.LOW)
+        self.clear_cache()
+        # setup is skipped if the pin is still configured (it is not after
+        # GPIO.cleanup() or if reconfigured elsewhere)
+        if (GPIO.getmode() != GPIO.BCM or
+                GPIO.gpio_function(reset_gpio) != GPIO.OUT):
+            GPIO.setmode(GPIO.BCM)
+            GPIO.setup(reset_gpio, GPIO.OUT, initial=GPIO.HIGH)
+        # the pin is HIGH here (initial setup value, or end of the last reset)
+        output = GPIO.output
+        output(reset_gpio, GPIO.LOW)
         time.sleep(0.3)
-        GPIO.output(reset_gpio, GPIO.HIGH)
-        time.sleep(7)
-        return self.check_sim()
+        output(reset_gpio, GPIO.HIGH)
+        # With fixed baud rate, the module reports +CPIN when ready; with
+        # autobauding it stays silent and is polled after a quiet period.
+        expire = time.monotonic() + 7  # seconds
+        delay = RESET_QUIET
+        quiet = time.monotonic() + delay
+        sim = None
+        while sim is None and time.monotonic() < expire:
+            if self._wait_incoming(min(expire, quiet)):
+                s = self.check_incoming()
+                quiet = time.monotonic() + delay
+                if s[0] == 'PIN':
+                    if s[1] == 'READY' or s[1].startswith(
+                            ('SIM P', 'PH_SIM P')):  # PIN/PUK requested
+                        sim = True
+                    elif s[1] == 'NOT INSERTED':
+                        sim = False
+                continue
+            sim = self.check_sim()
+            delay = 0.1
+            quiet = time.monotonic() + delay
+        return sim
 
     def serial_port(self):
         """
@@ -440,9 +695,9 @@ class SIM800L:
         :param msgtext: Text message
         :return: 'OK' if message is sent, otherwise 'ERROR'
         """
-        result = self.command('AT+CMGS="{}"\n'.format(destno),
+        result = self.command(f'AT+CMGS="{destno}"\n',
                               lines=99,
-                              waitfor=5000, # it means 4 seconds
+                              waitfor=5000,
                               msgtext=msgtext)
         self.check_incoming()
         if result and result == '>' and self.savbuf:
@@ -458,7 +713,7 @@ class SIM800L:
         :return: None if error, otherwise return a tuple including:
                 MSISDN origin number, SMS date string, SMS time string, SMS text
         """
-        result = self.command('AT+CMGR={}\n'.format(index_id), lines=99)
+        result = self.command(f'AT+CMGR={index_id}\n', lines=99)
         self.check_incoming()
         if result:
             params = result.split(',')
@@ -477,7 +732,7 @@ class SIM800L:
         :param index_id: index in the SMS message list starting from 1
         :return: None
         """
-        self.command('AT+CMGD={}\n'.format(index_id), lines=1)
+        self.command(f'AT+CMGD={index_id}\n', lines=1)
         self.check_incoming()
 
     def get_ip(self):
@@ -495,7 +750,7 @@ class SIM800L:
             if s[0] == 'IP':
                 ip_address = s[1]
                 break
-            time.sleep(0.1)
+            self._wait_incoming(expire)
             s = self.check_incoming()
         if self.check_incoming() != ('OK', None):
             logging.debug(
@@ -532,8 +787,8 @@ class SIM800L:
             logging.info("SIM800L - Already connected: %s", ip_address)
         else:
             r = self.command_ok(
-                'AT+SAPBR=3,1,"CONTYPE","GPRS";+SAPBR=3,1,"APN","' +
-                apn + '";+SAPBR=1,1',
+                'AT+SAPBR=3,1,"CONTYPE","GPRS";'
+                f'+SAPBR=3,1,"APN","{apn}";+SAPBR=1,1',
                 check_error=True)
             if r == "ERROR":
                 logging.critical("SIM800L - Cannot connect to GPRS")
@@ -575,13 +830,13 @@ class SIM800L:
                 if not keep_session:
                     self.disconnect_gprs()
                 return False
-            if not self.command_ok('AT+CSTT="' + apn + '";+CIICR'):
+            if not self.command_ok(f'AT+CSTT="{apn}";+CIICR'):
                 self.command('AT+CIPSHUT\n')
                 if not keep_session:
                     self.disconnect_gprs()
                 return False
         logging.info("SIM800L - IP Address: %s", self.command('AT+CIFSR\n'))
-        cmd = 'AT+CDNSGIP="' + url + '"'
+        cmd = f'AT+CDNSGIP="{url}"'
         if not self.command_ok(cmd):
             logging.error("SIM800L - error while querying DNS")
             self.command('AT+CIPSHUT\n')
@@ -605,7 +860,7 @@ class SIM800L:
                 dns = s[1]
                 logging.info("DNS: %s", dns)
                 break
-            time.sleep(0.1)
+            self._wait_incoming(expire)
             s = self.check_incoming()
             if not s:
                 return None
@@ -637,7 +892,7 @@ class SIM800L:
             if not keep_session:
                 self.disconnect_gprs()
             return False
-        cmd = 'AT+CNTP="' + time_server + '",' + str(time_zone_quarter)
+        cmd = f'AT+CNTP="{time_server}",{time_zone_quarter}'
         if not self.command_ok(cmd):
             logging.error("SIM800L - sync time did not return OK.")
         if not self.command_ok('AT+CNTP'):
@@ -654,7 +909,7 @@ class SIM800L:
                     return False
                 ret = True
                 break
-            time.sleep(0.1)
+            self._wait_incoming(expire)
             s = self.check_incoming()
         if ret:
             logging.debug("SIM800L - Network time sync successful")
@@ -717,20 +972,19 @@ class SIM800L:
         if use_ssl:
             use_ssl_string = ';+SSLOPT=0,0;+HTTPSSL=1'
         if ua:
-            ua_string = ';+HTTPPARA="UA","' + ua + '"'
+            ua_string = f';+HTTPPARA="UA","{ua}"'
         else:
             ua_string = ""
         while attempts:
             cmd = ('AT+HTTPINIT;'
                     '+HTTPPARA="CID",1'
-                    ';+HTTPPARA="URL","' + url + '"' + ua_string +
-                    ';+HTTPPARA="CONTENT","' + content_type + '"' +
-                    allow_redirection_string +
-                    use_ssl_string)  # PUT
+                    f';+HTTPPARA="URL","{url}"{ua_string}'
+                    f';+HTTPPARA="CONTENT","{content_type}"'
+                    f'{allow_redirection_string}{use_ssl_string}')  # PUT
             if method == "GET":
-                cmd = ('AT+HTTPINIT;+HTTPPARA="CID",1;+HTTPPARA="URL","' +
-                    url + '"' + allow_redirection_string +
-                    use_ssl_string)  # GET
+                cmd = ('AT+HTTPINIT;+HTTPPARA="CID",1;'
+                    f'+HTTPPARA="URL","{url}"'
+                    f'{allow_redirection_string}{use_ssl_string}')  # GET
             r = self.command_ok(cmd)
             if not r:
                 self.command('AT+HTTPTERM\n')
@@ -755,8 +1009,7 @@ class SIM800L:
                         self.disconnect_gprs()
                     return False
                 len_input = len(data)
-                cmd = 'AT+HTTPDATA=' + str(len_input) + ',' + str(
-                    http_timeout * 1000)
+                cmd = f'AT+HTTPDATA={len_input},{http_timeout * 1000}'
                 r = self.command_ok(cmd, check_download=True, check_error=True)
                 if r == "ERROR":
                     logging.critical("SIM800L - AT+HTTPDATA returned ERROR.")
@@ -781,7 +1034,7 @@ class SIM800L:
                 expire = time.monotonic() + http_timeout
                 s = self.check_incoming()
                 while s == ('GENERIC', None) and time.monotonic() < expire:
-                    time.sleep(0.1)
+                    self._wait_incoming(expire)
                     s = self.check_incoming()
                 if s != ("OK", None):
                     self.command('AT+HTTPTERM\n')
@@ -808,7 +1061,7 @@ class SIM800L:
             expire = time.monotonic() + http_timeout
             s = self.check_incoming()
             while s[0] != 'HTTPACTION_' + method and time.monotonic() < expire:
-                time.sleep(0.1)
+                self._wait_incoming(expire)
                 s = self.check_incoming()
             if s[0] != 'HTTPACTION_' + method:
                 if attempts > 1:
@@ -849,14 +1102,15 @@ class SIM800L:
                     if not keep_session:
                         self.disconnect_gprs()
                     return False
-            ret_data = ''
+            raw_data = bytearray()
             expire = time.monotonic() + http_timeout
-            while len(ret_data) < len_read and time.monotonic() < expire:
-                ret_data += self.ser.read(len_read).decode(
-                    encoding='utf-8', errors='ignore')
-            logging.debug(
-                "Returned data: '%s'",
-                ret_data.replace("\n", "\\n").replace("\r", "\\r"))
+            while len(raw_data) < len_read and time.monotonic() < expire:
+                raw_data += self._read(len_read - len(raw_data))
+            ret_data = raw_data.decode(encoding='utf-8', errors='ignore')
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(
+                    "Returned data: '%s'",
+                    ret_data.replace("\n", "\\n").replace("\r", "\\r"))
             r = self.check_incoming()
             if r != ("OK", None) and ret_data[-5:].strip() == 'OK':
                 r = ("OK", None)
@@ -873,10 +1127,10 @@ class SIM800L:
                 if not keep_session:
                     self.disconnect_gprs()
                 return False
-            if len(ret_data) != len_read:
+            if len(raw_data) != len_read:
                 logging.warning(
                     "Length of returned data: %d. Expected: %d",
-                    len(ret_data), len_read)
+                    len(raw_data), len_read)
             r = self.command_ok('AT+HTTPTERM')
             if not r:
                 self.command('AT+HTTPTERM\n')
@@ -920,75 +1174,194 @@ class SIM800L:
             return None
         if not rec:
             return False
+        fields = reply_fields(rec, '+CMGL')  # <index>,<stat>,...
+        if len(fields) < 2 or not fields[0].isnumeric():
+            return False
+        index = int(fields[0])
+        if fields[1].startswith('"STO'):
+            logging.critical("SIM800L - Deleting message: %s", rec)
+            try:
+                self.delete_sms(index)
+            except Exception:
+                return None
+            return False
+        if not fields[1].startswith('"REC'):
+            return False
         try:
-            index_s = re.sub(r'\+CMGL: (\d*),"STO.*', r'\1', rec)
-            if index_s.isnumeric():
-                logging.critical("SIM800L - Deleting message: %s", rec)
-                self.delete_sms(int(index_s))
-                return False
-        except Exception:
-            return None
-        try:
-            index = int(re.sub(r'\+CMGL: (\d*),"REC.*', r'\1', rec))
             data = self.read_sms(index)
             self.delete_sms(index)
         except Exception:
             return False
         return data
 
+    def _in_waiting(self):
+        """
+        Return the number of received bytes not read yet
+        (buffered, or waiting in the serial port)
+        """
+        return len(self._rxbuf) + self.ser.in_waiting
+
+    def _wait_incoming(self, expire):
+        """
+        Wait until data is received from the module (or the deadline is
+        reached), blocking on the serial port instead of polling it
+        :param expire: deadline (time.monotonic() value)
+        :return: True if data can be read, otherwise False
+        """
+        if b'\n' in self._rxbuf:
+            return True
+        timeout = expire - time.monotonic()
+        if timeout <= 0:
+            return False
+        return self._select(timeout)
+
+    def _select(self, timeout):
+        """
+        Block on the serial port until data can be read (or timeout)
+        :param timeout: timeout in seconds
+        :return: True if data can be read, otherwise False
+        """
+        readable, _, _ = select.select([self.ser.fileno()], [], [], timeout)
+        if not readable:
+            return False
+        if not self.ser.in_waiting:  # readable without data: hangup
+            raise serial.SerialException(
+                "SIM800L - serial port readable with no data "
+                "(device disconnected?)")
+        return True
+
+    def _readline(self):
+        """
+        Read a line from the module. Data is read from the serial port in
+        chunks including all the available bytes; the exceeding part is
+        kept in the receive buffer for the next reads.
+        :return: line (bytes) including the ending newline; partial or empty
+            line in case of timeout
+        """
+        timeout = self.ser.timeout
+        expire = None if timeout is None else time.monotonic() + timeout
+        start = 0
+        while True:
+            i = self._rxbuf.find(b'\n', start)
+            if i >= 0:
+                line = bytes(self._rxbuf[:i + 1])
+                del self._rxbuf[:i + 1]
+                return line
+            start = len(self._rxbuf)
+            chunk = self.ser.read(self.ser.in_waiting or 1)
+            if chunk:
+                self._rxbuf += chunk
+            if not chunk or (
+                    expire is not None and time.monotonic() > expire):
+                line = bytes(self._rxbuf)
+                del self._rxbuf[:]
+                return line
+
+    def _readlines(self):
+        """
+        Read lines from the module until timeout
+        :return: list of lines (bytes)
+        """
+        lines = []
+        while True:
+            line = self._readline()
+            if line:
+                lines.append(line)
+            if not line.endswith(b'\n'):
+                return lines
+
+    def _read_until(self, patterns, expire):
+        """
+        Read from the module into the receive buffer until one of the
+        patterns is received, or the deadline is reached
+        :param patterns: tuple of bytes to look for
+        :param expire: deadline (time.monotonic() value)
+        :return: True if a pattern is received, otherwise False
+        """
+        while not any(p in self._rxbuf for p in patterns):
+            timeout = expire - time.monotonic()
+            if timeout <= 0:
+                return False
+            if self._select(timeout):
+                self._rxbuf += self.ser.read(self.ser.in_waiting)
+        return True
+
+    def _read(self, size):
+        """
+        Read up to "size" bytes from the module, starting with the buffered
+        ones
+        :param size: number of bytes
+        :return: bytes (less than "size" in case of timeout)
+        """
+        data = bytes(self._rxbuf[:size])
+        del self._rxbuf[:size]
+        if len(data) < size:
+            data += self.ser.read(size - len(data))
+        return data
+
     def command(self,
             cmdstr, lines=1, waitfor=500, msgtext=None, flush_input=True):
         """
         Executes an AT command
-        :param cmdstr: AT command string
+        :param cmdstr: AT command string (or gsm03.38 bytes, already encoded)
         :param lines: number of expexted lines
-        :param waitfor: number of milliseconds to waith for the returned data
+        :param waitfor: if more than 1000, number of milliseconds to wait
+            for the final result code (after sending the SMS text)
         :param msgtext: SMS text; to be used in case of SMS message command
         :param flush_input: True if residual input is flushed before sending
             the command. False disables flushing.
         :return: returned data (string); None in case of no data (or module error).
         """
-        while self.ser.in_waiting and flush_input:
+        while self._in_waiting() and flush_input:
             flush = self.check_incoming()
             logging.debug("SIM800L - Flushing %s", flush)
-        logging.log(5,  # VERBOSE
-            "SIM800L - Writing '%s'",
-            cmdstr.replace("\n", "\\n").replace("\r", "\\r"))
-        self.ser.write(convert_gsm(cmdstr))
+        if isinstance(cmdstr, bytes):
+            cmdbytes = cmdstr
+        else:
+            cmdbytes = convert_command(cmdstr)
+        verbose = logging.getLogger().isEnabledFor(VERBOSE)
+        if verbose:
+            if isinstance(cmdstr, bytes):
+                cmdstr = cmdstr.decode('gsm03.38', errors="ignore")
+            logging.log(VERBOSE,
+                "SIM800L - Writing '%s'",
+                cmdstr.replace("\n", "\\n").replace("\r", "\\r"))
+        self.ser.write(cmdbytes)
         if lines == 0:
             return None
         if msgtext:
+            self._read_until(
+                (b'>', b'ERROR'), time.monotonic() + SMS_PROMPT_TIMEOUT)
             self.ser.write(convert_gsm(msgtext) + b'\x1A')
-        if waitfor > 1000:  # this is kept from the original code...
-            time.sleep((waitfor - 1000) / 1000)
-        buf = self.ser.readline().strip()  # discard linefeed etc
+        if waitfor > 1000:
+            self._read_until(
+                FINAL_RESULT_CODES, time.monotonic() + waitfor / 1000)
+        buf = self._readline().strip()  # discard linefeed etc
         if lines == -1:
             if buf:
-                buf = [buf] + self.ser.readlines()
+                buf = [buf] + self._readlines()
             else:
-                buf = self.ser.readlines()
+                buf = self._readlines()
             if not buf:
                 return None
-            result = ""
-            for i in buf:
-                result += convert_to_string(i) + "\n"
-            return result
+            return "".join(convert_to_string(i) + "\n" for i in buf)
         if not buf:
-            buf = self.ser.readline()
+            buf = self._readline()
         if not buf:
             return None
         result = convert_to_string(buf)
         if lines > 1:
-            self.savbuf = ''
+            saved = []
             for i in range(lines - 1):
-                buf = self.ser.readline()
+                buf = self._readline()
                 if not buf:
-                    return result
-                buf = convert_to_string(buf)
-                if not buf == '' and not buf == 'OK' and not buf.startswith(
-                        '+CMTI: "SM",'):
-                    self.savbuf += buf + '\n'
-        logging.log(5, "SIM800L - Returning '%s'", result)  # VERBOSE
+                    break
+                raw = buf.strip(GSM_BLANKS)
+                if raw and raw != b'OK' and not raw.startswith(CMTI_SM):
+                    saved.append(convert_to_string(raw) + '\n')
+            self.savbuf = ''.join(saved)
+        if verbose:
+            logging.log(VERBOSE, "SIM800L - Returning '%s'", result)
         return result
 
     def command_ok(self,
@@ -999,7 +1372,7 @@ class SIM800L:
                    attempts=2):
         """
         Send AT command to the device and check that the return sting is OK
-        :param cmd: AT command
+        :param cmd: AT command (string, or gsm03.38 bytes)
         :param check_download: True if the "DOWNLOAD" return sting has to be
                                 checked
         :param check_error: True if the "ERROR" return sting has to be checked
@@ -1008,8 +1381,12 @@ class SIM800L:
         :return: True = OK received, False = OK not received. If check_error,
                     can return "ERROR"; if check_download, can return "DOWNLOAD"
         """
-        logging.debug("SIM800L - Sending command '%s'", cmd)
-        r = self.command(cmd + "\n")
+        if isinstance(cmd, bytes):
+            logging.debug("SIM800L - Sending command %s", cmd)
+            r = self.command(cmd + b"\n")
+        else:
+            logging.debug("SIM800L - Sending command '%s'", cmd)
+            r = self.command(cmd + "\n")
         while attempts:
             if not r:
                 r = ""
@@ -1025,7 +1402,7 @@ class SIM800L:
                 while (s[0] == 'GENERIC' and
                         not s[1] and
                         time.monotonic() < expire):
-                    time.sleep(0.1)
+                    self._wait_incoming(expire)
                     s = self.check_incoming()
                 if s == ("OK", None):
                     return True
@@ -1063,7 +1440,7 @@ class SIM800L:
                     attempts -= 1
                     continue
                 logging.error(
-                    "SIM800L - wrong '" + cmd + "' return message: %s", r)
+                    "SIM800L - wrong '%s' return message: %s", cmd, r)
                 return False
             return answer
 
@@ -1073,212 +1450,254 @@ class SIM800L:
         :return: tuple
         """
         buf = None
-        if self.ser.in_waiting:
-            buf = self.ser.readline()
+        if self._in_waiting():
+            buf = self._readline()
+            while not buf.strip(GSM_BLANKS) and self._in_waiting():
+                buf = self._readline()
             buf = convert_to_string(buf)
-            while buf.strip() == "" and self.ser.in_waiting:
-                buf = self.ser.readline()
-                buf = convert_to_string(buf)
             if not buf:
                 return "GENERIC", buf
             logging.debug("SIM800L - read line: '%s'", buf)
             params = buf.split(',')
+            handler = self._urc_handlers.get(params[0])
+            if not handler:
+                head, sep, _ = params[0].partition(': ')
+                handler = sep and self._urc_handlers.get(head + sep)
+            if not handler:
+                handler = self._urc_prefix_handlers.get(params[0][:5])
+            if handler:
+                ret = handler(self, buf, params)
+                if ret:
+                    return ret
+        return "GENERIC", buf
 
-            # +HTTPACTION (HTTP GET and PUT methods)
-            if (len(params) == 3 and len(params[0]) == 14 and
-                    params[0].startswith("+HTTPACTION: ")):
-                valid = False
-                try:
-                    method = httpaction_method[params[0][-1]]
-                except KeyError:
-                    method = httpaction_method['X']
-                try:
-                    error_message = httpaction_status_codes[params[1]]
-                except KeyError:
-                    error_message = httpaction_status_codes['000']
-                if params[1] in ('200', '301'):
-                    valid = True
-                else:
-                    logging.critical(
-                        'SIM800L - HTTPACTION_' + method +
-                        ' return code: %s, %s="%s"',
-                        buf, params[1], error_message)
-                if params[1] == '301':
-                    logging.info(
-                        "SIM800L - HTTPACTION_GET 301 Moved Permanently.")
-                if not params[2].strip().isnumeric():
-                    return "HTTPACTION_" + method, False, 0
-                return "HTTPACTION_" + method, valid, int(params[2])
-
-            # +COPN (Read Operator Names)
-            elif params[0].startswith("+COPN: "):
-                numeric = params[0].split(':')[1].strip().replace('"', "")
-                name = params[1].strip().replace('"', "").strip()
-                return "COPN", numeric, name
-
-            # +CFUN (Read Phone functionality indication)
-            elif params[0].startswith("+CFUN: "):
-                numeric = params[0].split(':')[1].strip()
-                if numeric == "0":
-                    logging.debug(
-                        "SIM800L - CFUN - Minimum functionality.")
-                if numeric == "1":
-                    logging.debug(
-                        "SIM800L - CFUN - Full functionality (Default).")
-                if numeric == "4":
-                    logging.debug(
-                        "SIM800L - CFUN - Disable phone both transmit"
-                        " and receive RF circuits.")
-                return "CFUN", numeric
-
-            # +CPIN (Read PIN)
-            elif params[0].startswith("+CPIN: "):
-                pin = params[0].split(':')[1].strip()
-                return "PIN", pin
-
-            # Call Ready
-            elif params[0] == "Call Ready":
-                return "MSG", params[0]
-
-            # SMS Ready
-            elif params[0] == "SMS Ready":
-                return "MSG", params[0]
-
-            # +CREG (Read Registration status)
-            elif params[0].startswith("+CREG: "):
-                numeric = params[0].split(':')[1].strip()
-                if numeric == "0":
-                    logging.debug(
-                        "SIM800L - CREG - Not registered, not searching.")
-                if numeric == "1":
-                    logging.debug(
-                        "SIM800L - CREG - Registered, home network.")
-                if numeric == "2":
-                    logging.debug(
-                        "SIM800L - CREG - Not registered, searching.")
-                if numeric == "3":
-                    logging.debug(
-                        "SIM800L - CREG - Registration denied.")
-                if numeric == "4":
-                    logging.debug(
-                        "SIM800L - CREG - Unknown.")
-                if numeric == "5":
-                    logging.debug(
-                        "SIM800L - CREG - Registered, roaming.")
-                return "CREG", numeric
-
-            # +CTZV (Read Time Zone)
-            elif params[0].startswith("+CTZV: "):
-                tz1 = params[0].split(':')[1].strip()
-                tz2 = params[1].strip()
-                return "CTZV", tz1, tz2
-
-            # *PSUTTZ (Refresh time and time zone by network.)
-            elif params[0].startswith("*PSUTTZ: "):
-                year = params[0].split(':')[1].strip()
-                month = params[1].strip()
-                day = params[2].strip()
-                hour = params[3].strip()
-                minute = params[4].strip()
-                second = params[5].strip()
-                tz1 = params[6].strip().replace('"', "")
-                tz2 = params[7].strip()
-                return (
-                    "PSUTTZ", year, month, day, hour, minute, second, tz1, tz2)
-
-            # DST (Read Network Daylight Saving Time)
-            elif params[0].startswith("DST: "):
-                dst = params[0].split(':')[1].strip()
-                return "DST", dst
-
-            # RDY (Power procedure completed)
-            elif params[0] == "RDY":
-                return "RDY", None
-
-            # +SAPBR (IP address)
-            elif params[0].startswith("+SAPBR: "):
-                ip_address = params[2].replace('"', "")
-                if (params[0].split(':')[1].strip() == "1" and
-                        params[1].strip() == "1"):
-                    return "IP", ip_address
-                return "IP", None
-
-            # +CMTI (legacy code, partially revised) fires callback_msg()
-            elif params[0].startswith("+CMTI"):
-                self._msgid = int(params[1])
-                if self.msg_action:
-                    self.msg_action(int(params[1]))
-                return "CMTI", self._msgid
-
-            # ERROR
-            elif params[0] == "ERROR":
-                return "ERROR", None
-
-            # NO CARRIER (legacy code, partially revised) fires callback_no_carrier()
-            elif params[0] == "NO CARRIER":
-                self.no_carrier_action()
-                return "NOCARRIER", None
-
-            # +CDNSGIP (DNS query)
-            elif params[0].startswith('+CDNSGIP: '):
-                if params[0].split(':')[1].strip() != '1':
-                    if params[1] == '8':
-                        return "DNS", None, "DNS_COMMON_ERROR"
-                    elif params[1] == '3':
-                        return "DNS", None, "DNS_NETWORK_ERROR"
-                    else:
-                        return "DNS", None, "DNS_UNKNOWN_ERROR" + params[1]
-                dns = params[2].replace('"', '').strip()
-                logging.info("DNS: %s", dns)
-                if len(params) > 3:
-                    return "DNS", dns, params[3].replace('"', '').strip()
-                else:
-                    return "DNS", dns, params[1].replace('"', '').strip()
-
-            # +CNTP (NTP sync)
-            elif params[0].startswith('+CNTP: '):
-                if params[0] == '+CNTP: 1':
-                    logging.debug("SIM800L - Network time sync successful")
-                    return "NTP", self.get_date(), 0
-                elif params[0] == '+CNTP: 61':
-                    logging.error("SIM800L - Sync time network error")
-                    return "NTP", None, 61
-                elif params[0] == '+CNTP: 62':
-                    logging.error("SIM800L - Sync time DNS resolution error")
-                    return "NTP", None, 62
-                elif params[0] == '+CNTP: 63':
-                    logging.error("SIM800L - Sync time connection error")
-                    return "NTP", None, 63
-                elif params[0] == '+CNTP: 64':
-                    logging.error("SIM800L - Sync time service response error")
-                    return "NTP", None, 64
-                elif params[0] == '+CNTP: 65':
-                    logging.error(
-                        "SIM800L - Sync time service response timeout")
-                    return "NTP", None, 65
-                else:
-                    logging.error(
-                        "SIM800L - Sync time service - Unknown error code '%s'",
-                        params[0])
-                    return "NTP", None, 1
-
-            elif params[0] == "RING":
-                if self.incoming_action:
-                    self.incoming_action()
-                return "RING", None
-
-            elif params[0].startswith("+CLIP"):
-                number = params[0].split(": ")[-1].replace('"', "")
-                if self.clip_action:
-                    self.clip_action(number)
-                return "CLIP", number
-
-            # OK
-            elif buf.strip() == "OK":
-                return "OK", None
+    # Handlers of the messages decoded by check_incoming(); each handler gets
+    # the read line and its comma separated fields, returning the decoded
+    # tuple (or None if the line is not valid for the handler).
 
-            # DOWNLOAD
-            elif buf.strip() == "DOWNLOAD":
-                return "DOWNLOAD", None
+    def _urc_httpaction(self, buf, params):
+        # +HTTPACTION (HTTP GET and PUT methods)
+        if len(params) != 3 or len(params[0]) != 14:
+            return None
+        valid = False
+        try:
+            method = httpaction_method[params[0][-1]]
+        except KeyError:
+            method = httpaction_method['X']
+        try:
+            error_message = httpaction_status_codes[params[1]]
+        except KeyError:
+            error_message = httpaction_status_codes['000']
+        if params[1] in ('200', '301'):
+            valid = True
+        else:
+            logging.critical(
+                'SIM800L - HTTPACTION_%s return code: %s, %s="%s"',
+                method, buf, params[1], error_message)
+        if params[1] == '301':
+            logging.info(
+                "SIM800L - HTTPACTION_GET 301 Moved Permanently.")
+        if not params[2].strip().isnumeric():
+            return "HTTPACTION_" + method, False, 0
+        return "HTTPACTION_" + method, valid, int(params[2])
+
+    def _urc_copn(self, buf, params):
+        # +COPN (Read Operator Names)
+        numeric = params[0].split(':')[1].strip().replace('"', "")
+        name = params[1].strip().replace('"', "").strip()
+        return "COPN", numeric, name
+
+    def _urc_cfun(self, buf, params):
+        # +CFUN (Read Phone functionality indication)
+        numeric = params[0].split(':')[1].strip()
+        if numeric == "0":
+            logging.debug(
+                "SIM800L - CFUN - Minimum functionality.")
+        if numeric == "1":
+            logging.debug(
+                "SIM800L - CFUN - Full functionality (Default).")
+        if numeric == "4":
+            logging.debug(
+                "SIM800L - CFUN - Disable phone both transmit"
+                " and receive RF circuits.")
+        return "CFUN", numeric
+
+    def _urc_cpin(self, buf, params):
+        # +CPIN (Read PIN): the SIM might have been changed
+        self._discard_cache('check_sim', 'get_service_provider')
+        pin = params[0].split(':')[1].strip()
+        return "PIN", pin
+
+    def _urc_ready(self, buf, params):
+        # Call Ready, SMS Ready
+        return "MSG", params[0]
+
+    def _urc_creg(self, buf, params):
+        # +CREG (Read Registration status)
+        self._discard_cache('is_registered', 'get_operator')
+        numeric = params[0].split(':')[1].strip()
+        if numeric == "0":
+            logging.debug(
+                "SIM800L - CREG - Not registered, not searching.")
+        if numeric == "1":
+            logging.debug(
+                "SIM800L - CREG - Registered, home network.")
+        if numeric == "2":
+            logging.debug(
+                "SIM800L - CREG - Not registered, searching.")
+        if numeric == "3":
+            logging.debug(
+                "SIM800L - CREG - Registration denied.")
+        if numeric == "4":
+            logging.debug(
+                "SIM800L - CREG - Unknown.")
+        if numeric == "5":
+            logging.debug(
+                "SIM800L - CREG - Registered, roaming.")
+        return "CREG", numeric
+
+    def _urc_ctzv(self, buf, params):
+        # +CTZV (Read Time Zone)
+        tz1 = params[0].split(':')[1].strip()
+        tz2 = params[1].strip()
+        return "CTZV", tz1, tz2
+
+    def _urc_psuttz(self, buf, params):
+        # *PSUTTZ (Refresh time and time zone by network.)
+        year = params[0].split(':')[1].strip()
+        month = params[1].strip()
+        day = params[2].strip()
+        hour = params[3].strip()
+        minute = params[4].strip()
+        second = params[5].strip()
+        tz1 = params[6].strip().replace('"', "")
+        tz2 = params[7].strip()
+        return (
+            "PSUTTZ", year, month, day, hour, minute, second, tz1, tz2)
+
+    def _urc_dst(self, buf, params):
+        # DST (Read Network Daylight Saving Time)
+        dst = params[0].split(':')[1].strip()
+        return "DST", dst
+
+    def _urc_rdy(self, buf, params):
+        # RDY (Power procedure completed)
+        return "RDY", None
+
+    def _urc_sapbr(self, buf, params):
+        # +SAPBR (IP address)
+        ip_address = params[2].replace('"', "")
+        if (params[0].split(':')[1].strip() == "1" and
+                params[1].strip() == "1"):
+            return "IP", ip_address
+        return "IP", None
+
+    def _urc_cmti(self, buf, params):
+        # +CMTI (legacy code, partially revised) fires callback_msg()
+        self._msgid = int(params[1])
+        if self.msg_action:
+            self.msg_action(int(params[1]))
+        return "CMTI", self._msgid
+
+    def _urc_error(self, buf, params):
+        # ERROR
+        return "ERROR", None
+
+    def _urc_no_carrier(self, buf, params):
+        # NO CARRIER (legacy code, partially revised) fires callback_no_carrier()
+        self._discard_cache('is_registered', 'get_operator')
+        self.no_carrier_action()
+        return "NOCARRIER", None
+
+    def _urc_cdnsgip(self, buf, params):
+        # +CDNSGIP (DNS query)
+        if params[0].split(':')[1].strip() != '1':
+            if params[1] == '8':
+                return "DNS", None, "DNS_COMMON_ERROR"
+            elif params[1] == '3':
+                return "DNS", None, "DNS_NETWORK_ERROR"
+            else:
+                return "DNS", None, "DNS_UNKNOWN_ERROR" + params[1]
+        dns = params[2].replace('"', '').strip()
+        logging.info("DNS: %s", dns)
+        if len(params) > 3:
+            return "DNS", dns, params[3].replace('"', '').strip()
+        else:
+            return "DNS", dns, params[1].replace('"', '').strip()
 
-        return "GENERIC", buf
+    def _urc_cntp(self, buf, params):
+        # +CNTP (NTP sync)
+        if params[0] == '+CNTP: 1':
+            logging.debug("SIM800L - Network time sync successful")
+            return "NTP", self.get_date(), 0
+        elif params[0] == '+CNTP: 61':
+            logging.error("SIM800L - Sync time network error")
+            return "NTP", None, 61
+        elif params[0] == '+CNTP: 62':
+            logging.error("SIM800L - Sync time DNS resolution error")
+            return "NTP", None, 62
+        elif params[0] == '+CNTP: 63':
+            logging.error("SIM800L - Sync time connection error")
+            return "NTP", None, 63
+        elif params[0] == '+CNTP: 64':
+            logging.error("SIM800L - Sync time service response error")
+            return "NTP", None, 64
+        elif params[0] == '+CNTP: 65':
+            logging.error(
+                "SIM800L - Sync time service response timeout")
+            return "NTP", None, 65
+        else:
+            logging.error(
+                "SIM800L - Sync time service - Unknown error code '%s'",
+                params[0])
+            return "NTP", None, 1
+
+    def _urc_ring(self, buf, params):
+        # RING fires callback_incoming()
+        if self.incoming_action:
+            self.incoming_action()
+        return "RING", None
+
+    def _urc_clip(self, buf, params):
+        # +CLIP fires callback_clip()
+        number = params[0].split(": ")[-1].replace('"', "")
+        if self.clip_action:
+            self.clip_action(number)
+        return "CLIP", number
+
+    def _urc_ack(self, buf, params):
+        # OK, DOWNLOAD
+        if buf not in ("OK", "DOWNLOAD"):
+            return None
+        return buf, None
+
+    # Message handlers, indexed by the first comma separated field or by the
+    # text up to the first ": " (included); OK and DOWNLOAD are checked by
+    # their handler on the whole line
+    _urc_handlers = {
+        "+HTTPACTION: ": _urc_httpaction,
+        "+COPN: ": _urc_copn,
+        "+CFUN: ": _urc_cfun,
+        "+CPIN: ": _urc_cpin,
+        "Call Ready": _urc_ready,
+        "SMS Ready": _urc_ready,
+        "+CREG: ": _urc_creg,
+        "+CTZV: ": _urc_ctzv,
+        "*PSUTTZ: ": _urc_psuttz,
+        "DST: ": _urc_dst,
+        "RDY": _urc_rdy,
+        "+SAPBR: ": _urc_sapbr,
+        "ERROR": _urc_error,
+        "NO CARRIER": _urc_no_carrier,
+        "+CDNSGIP: ": _urc_cdnsgip,
+        "+CNTP: ": _urc_cntp,
+        "RING": _urc_ring,
+        "OK": _urc_ack,
+        "DOWNLOAD": _urc_ack,
+    }
+
+    # Messages matched by their first 5 characters only
+    _urc_prefix_handlers = {
+        "+CMTI": _urc_cmti,
+        "+CLIP": _urc_clip,
+    }
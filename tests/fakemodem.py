@@ -0,0 +1,93 @@
+"""
+Emulation of a SIM800 module on a pseudo-terminal, used by the tests
+"""
+
+import os
+import pty
+import threading
+import time
+
+from sim800l import SIM800L
+
+REPLIES = {
+    b'AT+CSMINS?': b'\r\n+CSMINS: 0,1\r\n\r\nOK\r\n',
+    b'AT+CREG?': b'\r\n+CREG: 0,1\r\n\r\nOK\r\n',
+    b'AT+CSQ': b'\r\n+CSQ: 20,0\r\n\r\nOK\r\n',
+    b'AT+COPS?': b'\r\n+COPS: 0,0,"VODAFONE"\r\n\r\nOK\r\n',
+    b'AT+CCLK?': b'\r\n+CCLK: "21/03/04,12:34:56+04"\r\n\r\nOK\r\n',
+    b'ATI': b'\r\nSIM800 R14.18\r\n\r\nOK\r\n',
+    b'AT+CIMI': b'\r\n222010123456789\r\n\r\nOK\r\n',
+    b'AT+CGMR': b'\r\nRevision:1418B04SIM800L24\r\n\r\nOK\r\n',
+}
+
+
+class FakeModem(threading.Thread):
+    """
+    Answer the AT commands written to the pseudo-terminal with the
+    replies of a table; "AT+CMGS=" commands get the SMS prompt, then the
+    text up to Ctrl-Z is collected and acknowledged with +CMGS.
+    """
+
+    def __init__(self, replies=None, delay=0.0, prompt_delay=0.0):
+        super().__init__(daemon=True)
+        self.master, self.slave = pty.openpty()
+        self.path = os.ttyname(self.slave)
+        self.replies = dict(REPLIES)
+        self.replies.update(replies or {})
+        self.delay = delay
+        self.prompt_delay = prompt_delay
+        self.received = []
+        self.start()
+
+    def send(self, data):
+        os.write(self.master, data)
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+    def run(self):
+        buf = b''
+        sms = False
+        while True:
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            buf += data
+            while True:
+                if sms:
+                    if b'\x1a' not in buf:
+                        break
+                    text, _, buf = buf.partition(b'\x1a')
+                    self.received.append(text)
+                    sms = False
+                    time.sleep(self.delay)
+                    self.send(b'\r\n+CMGS: 12\r\n\r\nOK\r\n')
+                    continue
+                line, sep, rest = buf.partition(b'\n')
+                if not sep:
+                    break
+                buf = rest
+                line = line.strip()
+                self.received.append(line)
+                if line.startswith(b'AT+CMGS='):
+                    time.sleep(self.prompt_delay)
+                    self.send(b'\r\n> ')
+                    sms = True
+                    continue
+                reply = self.replies.get(line)
+                if callable(reply):
+                    reply = reply()
+                if reply is not None:
+                    time.sleep(self.delay)
+                    self.send(reply)
+
+
+def make_modem(timeout=0.5, **kwargs):
+    """
+    Start a FakeModem and open a SIM800L instance on it
+    :return: tuple (FakeModem, SIM800L)
+    """
+    modem = FakeModem(**kwargs)
+    return modem, SIM800L(modem.path, timeout=timeout)
@@ -0,0 +1,85 @@
+import unittest
+from unittest import mock
+
+from sim800l.sim800l import ttl_cache
+
+
+class Module:
+    """
+    Minimal object with the _cache dictionary used by ttl_cache()
+    """
+
+    def __init__(self, results):
+        self._cache = {}
+        self.results = list(results)
+        self.calls = 0
+
+    def query(self, *args, **kwargs):
+        self.calls += 1
+        return self.results.pop(0)
+
+    timed = ttl_cache(0.5)(query)
+    forever = ttl_cache(None)(query)
+
+
+class TestTtlCache(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('sim800l.sim800l.time.monotonic')
+        self.monotonic = patcher.start()
+        self.monotonic.return_value = 100.0
+        self.addCleanup(patcher.stop)
+
+    def test_expiry(self):
+        module = Module(['a', 'b'])
+        self.assertEqual(module.timed(), 'a')
+        self.monotonic.return_value = 100.4
+        self.assertEqual(module.timed(), 'a')
+        self.monotonic.return_value = 100.5
+        self.assertEqual(module.timed(), 'b')
+        self.assertEqual(module.calls, 2)
+
+    def test_arguments(self):
+        module = Module(['a', 'b', 'c'])
+        self.assertEqual(module.timed(1), 'a')
+        self.assertEqual(module.timed(2), 'b')
+        self.assertEqual(module.timed(1), 'a')
+        self.assertEqual(module.timed(1, x=1), 'c')
+        self.assertEqual(module.calls, 3)
+
+    def test_none_not_cached(self):
+        module = Module([None, 'a'])
+        self.assertIsNone(module.timed())
+        self.assertEqual(module.timed(), 'a')
+
+    def test_false_cached_with_ttl(self):
+        # e.g., check_sim() returning False (SIM not inserted)
+        module = Module([False, True])
+        self.assertIs(module.timed(), False)
+        self.assertIs(module.timed(), False)
+        self.assertEqual(module.calls, 1)
+
+    def test_forever(self):
+        module = Module(['a', 'b'])
+        self.assertEqual(module.forever(), 'a')
+        self.monotonic.return_value = 1e9
+        self.assertEqual(module.forever(), 'a')
+        self.assertEqual(module.calls, 1)
+
+    def test_forever_failures_not_cached(self):
+        module = Module([None, False, 'a'])
+        self.assertIsNone(module.forever())
+        self.assertIs(module.forever(), False)
+        self.assertEqual(module.forever(), 'a')
+        self.assertEqual(module.forever(), 'a')
+        self.assertEqual(module.calls, 3)
+
+    def test_clear(self):
+        module = Module(['a', 'b'])
+        module.forever()
+        module._cache.clear()
+        self.assertEqual(module.forever(), 'b')
+
+
+if __name__ == '__main__':
+    unittest.main()
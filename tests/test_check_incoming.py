@@ -0,0 +1,113 @@
+import datetime
+import logging
+import time
+import unittest
+
+from fakemodem import make_modem
+
+# Line sent by the module, tuple returned by check_incoming(), callbacks fired
+URC_TABLE = [
+    ('+HTTPACTION: 0,200,26', ('HTTPACTION_GET', True, 26), []),
+    ('+HTTPACTION: 1,404,0', ('HTTPACTION_PUT', False, 0), []),
+    ('+HTTPACTION: 0,301,x', ('HTTPACTION_GET', False, 0), []),
+    ('+HTTPACTION: 0,200', ('GENERIC', '+HTTPACTION: 0,200'), []),
+    ('+HTTPACTION:0,200,26', ('GENERIC', '+HTTPACTION:0,200,26'), []),
+    ('+COPN: "22201","TIM"', ('COPN', '22201', 'TIM'), []),
+    ('+COPN:', ('GENERIC', '+COPN:'), []),
+    ('+CFUN: 1', ('CFUN', '1'), []),
+    ('+CFUN: 4', ('CFUN', '4'), []),
+    ('+CPIN: READY', ('PIN', 'READY'), []),
+    ('+CPIN: NOT INSERTED', ('PIN', 'NOT INSERTED'), []),
+    ('+CPIN:READY', ('GENERIC', '+CPIN:READY'), []),
+    ('Call Ready', ('MSG', 'Call Ready'), []),
+    ('Call Ready,1', ('MSG', 'Call Ready'), []),
+    ('Call Ready: x', ('GENERIC', 'Call Ready: x'), []),
+    ('SMS Ready', ('MSG', 'SMS Ready'), []),
+    ('SMS Ready,x', ('MSG', 'SMS Ready'), []),
+    ('+CREG: 1', ('CREG', '1'), []),
+    ('+CREG: 0,5', ('CREG', '0'), []),
+    ('+CREG:1', ('GENERIC', '+CREG:1'), []),
+    ('+CTZV: +04,1', ('CTZV', '+04', '1'), []),
+    ('*PSUTTZ: 2021,3,4,12,34,56,"+4",1',
+        ('PSUTTZ', '2021', '3', '4', '12', '34', '56', '+4', '1'), []),
+    ('DST: 1', ('DST', '1'), []),
+    ('DST:1', ('GENERIC', 'DST:1'), []),
+    ('RDY', ('RDY', None), []),
+    ('RDY: 1', ('GENERIC', 'RDY: 1'), []),
+    ('+SAPBR: 1,1,"10.0.0.1"', ('IP', '10.0.0.1'), []),
+    ('+SAPBR: 1,3,"0.0.0.0"', ('IP', None), []),
+    ('+CMTI: "SM",7', ('CMTI', 7), [('msg', 7)]),
+    ('ERROR', ('ERROR', None), []),
+    ('ERROR,1', ('ERROR', None), []),
+    ('ERROR: x', ('GENERIC', 'ERROR: x'), []),
+    ('ERRORX', ('GENERIC', 'ERRORX'), []),
+    ('NO CARRIER', ('NOCARRIER', None), ['nc']),
+    ('NO CARRIER,1', ('NOCARRIER', None), ['nc']),
+    ('+CDNSGIP: 1,"www.x.com","1.2.3.4"',
+        ('DNS', '1.2.3.4', 'www.x.com'), []),
+    ('+CDNSGIP: 1,"www.x.com","1.2.3.4","5.6.7.8"',
+        ('DNS', '1.2.3.4', '5.6.7.8'), []),
+    ('+CDNSGIP: 0,8', ('DNS', None, 'DNS_COMMON_ERROR'), []),
+    ('+CDNSGIP: 0,3', ('DNS', None, 'DNS_NETWORK_ERROR'), []),
+    ('+CDNSGIP: 0,9', ('DNS', None, 'DNS_UNKNOWN_ERROR9'), []),
+    ('+CNTP: 1',
+        ('NTP', datetime.datetime(2021, 3, 4, 12, 34, 56), 0), []),
+    ('+CNTP: 61', ('NTP', None, 61), []),
+    ('+CNTP: 65', ('NTP', None, 65), []),
+    ('+CNTP: 99', ('NTP', None, 1), []),
+    ('+CNTP:1', ('GENERIC', '+CNTP:1'), []),
+    ('RING', ('RING', None), ['ring']),
+    ('RING,1', ('RING', None), ['ring']),
+    ('RING: 1', ('GENERIC', 'RING: 1'), []),
+    ('+CLIP: "+391234",145,"",0,"",0',
+        ('CLIP', '+391234'), [('clip', '+391234')]),
+    ('+CLIPX', ('CLIP', '+CLIPX'), [('clip', '+CLIPX')]),
+    ('OK', ('OK', None), []),
+    ('OK ', ('OK', None), []),
+    ('OK,1', ('GENERIC', 'OK,1'), []),
+    ('OK: foo', ('GENERIC', 'OK: foo'), []),
+    ('DOWNLOAD', ('DOWNLOAD', None), []),
+    ('DOWNLOAD: 1', ('GENERIC', 'DOWNLOAD: 1'), []),
+    ('hello', ('GENERIC', 'hello'), []),
+    ('+CME ERROR: 10', ('GENERIC', '+CME ERROR: 10'), []),
+    ('', ('GENERIC', ''), []),
+]
+
+
+class TestCheckIncoming(unittest.TestCase):
+    """
+    check_incoming() decodes the messages of the module as the original
+    if/elif chain did (the table above was recorded from it)
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.modem, self.sim800l = make_modem()
+        self.events = []
+        self.sim800l.callback_msg(
+            lambda msgid: self.events.append(('msg', msgid)))
+        self.sim800l.callback_no_carrier(lambda: self.events.append('nc'))
+        self.sim800l.callback_incoming(lambda: self.events.append('ring'))
+        self.sim800l.callback_clip(
+            lambda number: self.events.append(('clip', number)))
+
+    def tearDown(self):
+        self.sim800l.ser.close()
+        self.modem.close()
+        logging.disable(logging.NOTSET)
+
+    def test_table(self):
+        for line, result, events in URC_TABLE:
+            with self.subTest(line=line):
+                self.events.clear()
+                self.modem.send(b'\r\n' + line.encode() + b'\r\n')
+                self.sim800l._wait_incoming(time.monotonic() + 1)
+                self.assertEqual(self.sim800l.check_incoming(), result)
+                self.assertEqual(self.events, events)
+
+    def test_no_data(self):
+        self.assertEqual(self.sim800l.check_incoming(), ('GENERIC', None))
+
+
+if __name__ == '__main__':
+    unittest.main()
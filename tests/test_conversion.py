@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from sim800l.sim800l import (
+    convert_command, convert_gsm, convert_to_string, reply_fields)
+
+# Characters of the GSM 03.38 alphabet (basic set and extension table)
+GSM_CHARS = ''.join(
+    char for char in (
+        seq.decode('gsm03.38', errors='ignore')
+        for code in range(128)
+        for seq in (bytes((code,)), bytes((0x1b, code))))
+    if len(char) == 1)
+
+
+class TestConvertGsm(unittest.TestCase):
+    """
+    convert_gsm() (translation table) encodes as the gsm03.38 codec
+    """
+
+    def test_alphabet(self):
+        for char in GSM_CHARS:
+            with self.subTest(char=char):
+                self.assertEqual(convert_gsm(char), char.encode('gsm03.38'))
+
+    def test_random_strings(self):
+        rnd = random.Random(0)
+        for _ in range(2000):
+            string = ''.join(rnd.choices(GSM_CHARS, k=rnd.randint(0, 40)))
+            self.assertEqual(convert_gsm(string), string.encode('gsm03.38'))
+
+    def test_ascii_outside_alphabet(self):
+        # ASCII characters without GSM mapping are left to the codec
+        for string in ('a`b', 'x\x01'):
+            with self.subTest(string=string):
+                with self.assertRaises(UnicodeEncodeError):
+                    string.encode('gsm03.38')
+                with self.assertRaises(UnicodeEncodeError):
+                    convert_gsm(string)
+
+    def test_convert_command(self):
+        self.assertEqual(convert_command('AT+CSQ\n'), b'AT+CSQ\n')
+        self.assertIs(convert_command('AT+CSQ\n'), convert_command('AT+CSQ\n'))
+
+
+class TestConvertToString(unittest.TestCase):
+    """
+    convert_to_string() (translation table) decodes as the gsm03.38 codec,
+    stripping the blanks
+    """
+
+    def test_all_bytes(self):
+        for code in range(256):
+            buf = bytes((code,)) + b'A'
+            with self.subTest(code=code):
+                self.assertEqual(
+                    convert_to_string(buf),
+                    buf.decode('gsm03.38', errors='ignore').strip())
+
+    def test_random_bytes(self):
+        rnd = random.Random(0)
+        for _ in range(5000):
+            buf = bytes(rnd.choices(range(256), k=rnd.randint(0, 40)))
+            self.assertEqual(
+                convert_to_string(buf),
+                buf.decode('gsm03.38', errors='ignore').strip())
+
+    def test_acknowledgements(self):
+        for buf, string in ((b'OK\r\n', 'OK'), (b'> ', '>'),
+                            (b'\r\n', ''), (b'ERROR\r\n', 'ERROR'),
+                            (b'DOWNLOAD\r\n', 'DOWNLOAD')):
+            with self.subTest(buf=buf):
+                self.assertEqual(convert_to_string(buf), string)
+
+    def test_gsm_letters_are_not_blanks(self):
+        # 0x09, 0x0b and 0x0c are letters in gsm03.38
+        self.assertEqual(convert_to_string(b'\tOK\r\n'), 'ÇOK')
+        self.assertEqual(convert_to_string(b'OK\x0b'), 'OKØ')
+
+
+class TestReplyFields(unittest.TestCase):
+
+    def test_fields(self):
+        self.assertEqual(reply_fields('+CSQ: 20,0', '+CSQ'), ['20', '0'])
+        self.assertEqual(reply_fields('+CSMINS: 0,1', '+CSMINS'), ['0', '1'])
+
+    def test_wrong_name(self):
+        self.assertEqual(reply_fields('+CSQ: 20,0', '+CBC'), [])
+        self.assertEqual(reply_fields('+CSQ:20,0', '+CSQ'), [])
+        self.assertEqual(reply_fields('', '+CSQ'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import logging
+import threading
+import time
+import unittest
+
+from fakemodem import make_modem
+
+
+class TestReadline(unittest.TestCase):
+    """
+    Buffered reading of the module lines (_rxbuf)
+    """
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.modem, self.sim800l = make_modem()
+
+    def tearDown(self):
+        self.sim800l.ser.close()
+        self.modem.close()
+        logging.disable(logging.NOTSET)
+
+    def test_line_split_across_chunks(self):
+        self.modem.send(b'+CSQ: 2')
+        threading.Timer(0.1, self.modem.send, (b'0,0\r\nOK\r\n',)).start()
+        self.assertEqual(self.sim800l._readline(), b'+CSQ: 20,0\r\n')
+        self.assertEqual(self.sim800l._readline(), b'OK\r\n')
+
+    def test_lines_in_one_chunk(self):
+        self.modem.send(b'\r\nRDY\r\n+CFUN: 1\r\n')
+        time.sleep(0.05)
+        self.assertEqual(self.sim800l._readline(), b'\r\n')
+        self.assertEqual(bytes(self.sim800l._rxbuf), b'RDY\r\n+CFUN: 1\r\n')
+        self.assertEqual(self.sim800l._in_waiting(), 15)
+        self.assertEqual(
+            self.sim800l._readlines(), [b'RDY\r\n', b'+CFUN: 1\r\n'])
+
+    def test_timeout(self):
+        self.modem.send(b'> ')
+        start = time.monotonic()
+        self.assertEqual(self.sim800l._readline(), b'> ')
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(self.sim800l._readline(), b'')
+        self.assertEqual(self.sim800l._rxbuf, b'')
+
+    def test_read_after_line(self):
+        self.modem.send(b'+HTTPREAD: 5\r\nhello\r\nOK\r\n')
+        time.sleep(0.05)
+        self.assertEqual(self.sim800l._readline(), b'+HTTPREAD: 5\r\n')
+        self.assertEqual(self.sim800l._read(5), b'hello')
+        self.assertEqual(self.sim800l._readlines(), [b'\r\n', b'OK\r\n'])
+
+    def test_command(self):
+        self.assertEqual(
+            self.sim800l.command('AT+CCLK?\n', lines=-1),
+            '+CCLK: "21/03/04,12:34:56+04"\n\nOK\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
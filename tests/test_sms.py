@@ -0,0 +1,47 @@
+import logging
+import time
+import unittest
+
+from fakemodem import make_modem
+
+
+class TestSendSms(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.modem = None
+
+    def tearDown(self):
+        self.sim800l.ser.close()
+        self.modem.close()
+        logging.disable(logging.NOTSET)
+
+    def send(self, **kwargs):
+        self.modem, self.sim800l = make_modem(**kwargs)
+        start = time.monotonic()
+        result = self.sim800l.send_sms('+391234', 'ciao €')
+        return result, time.monotonic() - start
+
+    def test_send(self):
+        result, elapsed = self.send()
+        self.assertIs(result, True)
+        self.assertLess(elapsed, 2)
+        self.assertEqual(
+            self.modem.received, [b'AT+CMGS="+391234"', b'ciao \x1be'])
+
+    def test_slow_prompt(self):
+        # the prompt wait does not reduce the time allowed for the reply
+        result, _ = self.send(prompt_delay=4, delay=3)
+        self.assertIs(result, True)
+        self.assertEqual(self.modem.received[-1], b'ciao \x1be')
+
+    def test_text_after_prompt(self):
+        self.modem, self.sim800l = make_modem(prompt_delay=0.8)
+        result = self.sim800l.command(
+            'AT+CMGS="+391234"\n', lines=99, msgtext='ciao')
+        self.assertEqual(result, '>')
+        self.assertEqual(self.sim800l.savbuf, '+CMGS: 12\n')
+
+
+if __name__ == '__main__':
+    unittest.main()